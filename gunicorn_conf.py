@@ -0,0 +1,24 @@
+"""Gunicorn settings for production.
+
+Run with:
+
+    gunicorn main:app -c gunicorn_conf.py
+
+For a single-host run without Gunicorn, the equivalent is:
+
+    uvicorn main:app --loop uvloop --http httptools --workers $(nproc)
+"""
+import multiprocessing
+import os
+
+from uvicorn_worker import UvicornWorker
+
+
+class UvloopWorker(UvicornWorker):
+    # Require uvloop and httptools instead of falling back to asyncio/h11
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = UvloopWorker
@@ -1,76 +1,299 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
-from typing import Optional
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from pydantic import BaseModel, Field
+from typing import Annotated, List, Optional
+import hashlib
 import math
 
-app = FastAPI(title="Financial Calculators API")
+import numpy as np
+import orjson
+
+
+class OrjsonResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder."""
+
+    def render(self, content) -> bytes:
+        try:
+            return orjson.dumps(content)
+        except orjson.JSONEncodeError:
+            # orjson rejects ints outside the 64-bit range, which very large
+            # money amounts can reach; the stdlib encoder handles them.
+            return super().render(content)
+
+
+app = FastAPI(
+    title="Financial Calculators API",
+    default_response_class=OrjsonResponse
+)
+
+
+class ETagMiddleware:
+    """Tag successful POST responses on the given paths with an ETag.
+
+    Plain ASGI middleware: it wraps send, buffering only the responses it
+    tags, and answers a matching If-None-Match with an empty 304.
+    """
+
+    def __init__(self, app, paths):
+        self.app = app
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] not in self.paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        # If-None-Match uses weak comparison, so W/ prefixes are ignored
+        if_none_match = Headers(scope=scope).get("if-none-match", "")
+        tags = [
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        ]
+
+        response_start = None
+        body = []
+
+        async def send_with_etag(message):
+            nonlocal response_start
+
+            if message["type"] == "http.response.start":
+                response_start = message
+                if message["status"] != 200:
+                    await send(message)
+                return
+
+            if (
+                message["type"] != "http.response.body"
+                or response_start["status"] != 200
+            ):
+                await send(message)
+                return
+
+            body.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            content = b"".join(body)
+            digest = hashlib.blake2b(content, digest_size=8).hexdigest()
+            etag = f'"{digest}"'
+
+            if etag in tags:
+                await send({
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": [(b"etag", etag.encode())]
+                })
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            # Extend the raw header list so repeated ones such as
+            # Set-Cookie survive
+            await send({
+                **response_start,
+                "headers": [
+                    *response_start["headers"],
+                    (b"etag", etag.encode())
+                ]
+            })
+            await send({"type": "http.response.body", "body": content})
+
+        await self.app(scope, receive, send_with_etag)
 
 @app.get("/")
-def root():
+async def root():
     return {"status": "ok"}
+# ---------------- HELPERS ----------------
+
+def round_money(value):
+    """Round a money amount half-up to a whole-unit int."""
+    return math.floor(value + 0.5)
+
+
+# Batch results are reported per scenario: a scenario whose formula has
+# no finite answer (e.g. a zero rate in an annuity factor) yields null
+# instead of failing the whole batch.
+
+def finite_or_none(values):
+    """Convert an array to a list, replacing nan/inf with None."""
+    return [v if math.isfinite(v) else None for v in values.tolist()]
+
+def round_money_list(values):
+    """Apply round_money to an array, replacing nan/inf with None."""
+    return [
+        round_money(v) if math.isfinite(v) else None
+        for v in values.tolist()
+    ]
+
+
+# Rates compounded through log1p(rate / 100) must stay above -100%
+GrowthRate = Annotated[float, Field(gt=-100)]
+
+# EMI compounds log1p(rate / 100 / 12), which must stay above -1200%
+LoanRate = Annotated[float, Field(gt=-1200)]
+
+
+def monthly_rate(annual_return):
+    """Monthly compounding rate equivalent to an annual return in percent."""
+    return math.expm1(math.log1p(annual_return / 100) / 12)
+
+def monthly_growth(annual_return, months):
+    """Return (1 + monthly_rate(annual_return)) ** months - 1."""
+    return math.expm1(months * math.log1p(monthly_rate(annual_return)))
+# ---------------- BATCH HELPERS ----------------
+
+# Upper bound on scenarios per batch request
+MAX_BATCH_SIZE = 10_000
+
+
+def batch_columns(*columns):
+    """Convert parallel input lists into float64 arrays of equal length."""
+    if len({len(column) for column in columns}) > 1:
+        raise HTTPException(
+            status_code=422,
+            detail="All input lists must have the same length"
+        )
+
+    return [np.asarray(column, dtype=np.float64) for column in columns]
+
+def batch_monthly_growth(annual_return, months):
+    """Array form of monthly_growth, using the same expm1/log1p steps."""
+    monthly_r = np.expm1(np.log1p(annual_return / 100) / 12)
+    return np.expm1(months * np.log1p(monthly_r))
+
+
+# Scenarios per tile, sized so a tile's working set stays in L2 cache
+BATCH_TILE_SIZE = 4096
+
+def compute_in_tiles(kernel, columns, n_outputs):
+    """Run kernel over tiles of SoA columns into a preallocated output."""
+    n = columns.shape[1]
+    out = np.empty((n_outputs, n))
+
+    with np.errstate(all="ignore"):
+        for start in range(0, n, BATCH_TILE_SIZE):
+            tile = slice(start, start + BATCH_TILE_SIZE)
+            out[:, tile] = kernel(*columns[:, tile])
+
+    return out
 # ---------------- SIP ----------------
 
 class SIPInput(BaseModel):
     monthly_sip: float
     years: int
-    annual_return: float
+    annual_return: GrowthRate
 
 def sip_calculator(monthly_sip, years, annual_return):
-    monthly_r = (1 + annual_return / 100) ** (1 / 12) - 1
+    monthly_r = monthly_rate(annual_return)
     months = years * 12
 
-    corpus = 0
     total_invested = monthly_sip * months
 
-    for _ in range(months):
-        corpus = (corpus + monthly_sip) * (1 + monthly_r)
+    # Future value of an annuity due
+    if monthly_r == 0:
+        corpus = monthly_sip * months
+    else:
+        growth_m1 = monthly_growth(annual_return, months)
+        corpus = monthly_sip * growth_m1 / monthly_r * (1 + monthly_r)
 
     return {
-        "maturity_value": round(corpus, 0),
-        "total_invested": round(total_invested, 0),
-        "wealth_gained": round(corpus - total_invested, 0),
+        "maturity_value": round_money(corpus),
+        "total_invested": round_money(total_invested),
+        "wealth_gained": round_money(corpus - total_invested),
         "multiple": round(corpus / total_invested, 2)
     }
 
 @app.post("/sip")
-def sip_api(data: SIPInput):
+async def sip_api(data: SIPInput):
     return sip_calculator(
         data.monthly_sip,
         data.years,
         data.annual_return
     )
+
+class SIPBatchInput(BaseModel):
+    monthly_sip: List[float] = Field(max_length=MAX_BATCH_SIZE)
+    years: List[int] = Field(max_length=MAX_BATCH_SIZE)
+    annual_return: List[GrowthRate] = Field(max_length=MAX_BATCH_SIZE)
+
+def sip_batch_calculator(monthly_sip, years, annual_return):
+    months = years * 12
+
+    with np.errstate(all="ignore"):
+        monthly_r = np.expm1(np.log1p(annual_return / 100) / 12)
+        total_invested = monthly_sip * months
+
+        growth_m1 = np.expm1(months * np.log1p(monthly_r))
+        corpus = np.where(
+            monthly_r == 0,
+            total_invested,
+            monthly_sip * growth_m1 / monthly_r * (1 + monthly_r)
+        )
+        multiple = corpus / total_invested
+
+    return {
+        "maturity_value": round_money_list(corpus),
+        "total_invested": round_money_list(total_invested),
+        "wealth_gained": round_money_list(corpus - total_invested),
+        "multiple": finite_or_none(np.round(multiple, 2))
+    }
+
+@app.post("/sip/batch")
+def sip_batch_api(data: SIPBatchInput):
+    return sip_batch_calculator(*batch_columns(
+        data.monthly_sip,
+        data.years,
+        data.annual_return
+    ))
 # ---------------- SIP STEP-UP ----------------
 
 class SIPStepUpInput(BaseModel):
     monthly_sip: float
     years: int
-    annual_return: float
+    annual_return: GrowthRate
     annual_step_up: float
 
 def sip_step_up_calculator(monthly_sip, years, annual_return, annual_step_up):
-    monthly_r = (1 + annual_return / 100) ** (1 / 12) - 1
+    monthly_r = monthly_rate(annual_return)
     total_months = years * 12
 
-    corpus = 0
-    total_invested = 0
-    current_sip = monthly_sip
+    g = 1 + monthly_r
+    g12_m1 = monthly_growth(annual_return, 12)
+    g12 = g12_m1 + 1
+    s = 1 + annual_step_up / 100
 
-    for month in range(1, total_months + 1):
-        if month > 1 and (month - 1) % 12 == 0:
-            current_sip *= (1 + annual_step_up / 100)
+    # Each year's SIP is constant, so every year is an annuity due that
+    # keeps compounding until maturity; the yearly terms form a geometric
+    # series in g12 / s.
+    if monthly_r == 0:
+        year_factor = 12
+    else:
+        year_factor = g12_m1 / monthly_r * g
+
+    if math.isclose(g12, s):
+        corpus = monthly_sip * year_factor * years * g12 ** (years - 1)
+    else:
+        corpus = monthly_sip * year_factor * (
+            (g12 ** years - s ** years) / (g12 - s)
+        )
 
-        corpus = (corpus + current_sip) * (1 + monthly_r)
-        total_invested += current_sip
+    if s == 1:
+        total_invested = monthly_sip * total_months
+    else:
+        total_invested = monthly_sip * 12 * (s ** years - 1) / (s - 1)
 
     return {
-        "maturity_value": round(corpus, 0),
-        "total_invested": round(total_invested, 0),
-        "wealth_gained": round(corpus - total_invested, 0),
+        "maturity_value": round_money(corpus),
+        "total_invested": round_money(total_invested),
+        "wealth_gained": round_money(corpus - total_invested),
         "multiple": round(corpus / total_invested, 2)
     }
 
 @app.post("/sip-step-up")
-def sip_step_up_api(data: SIPStepUpInput):
+async def sip_step_up_api(data: SIPStepUpInput):
     return sip_step_up_calculator(
         data.monthly_sip,
         data.years,
@@ -82,7 +305,7 @@ def sip_step_up_api(data: SIPStepUpInput):
 class EMIInput(BaseModel):
     loan_amount: float
     tenure_years: int
-    annual_interest_rate: float
+    annual_interest_rate: LoanRate
 
 def emi_calculator(loan_amount, tenure_years, annual_interest_rate):
     r = annual_interest_rate / 100 / 12
@@ -91,57 +314,114 @@ def emi_calculator(loan_amount, tenure_years, annual_interest_rate):
     if r == 0:
         emi = loan_amount / n
     else:
-        emi = loan_amount * r * ((1 + r) ** n) / ((1 + r) ** n - 1)
+        growth_m1 = math.expm1(n * math.log1p(r))
+        emi = loan_amount * r * (growth_m1 + 1) / growth_m1
 
     total_payment = emi * n
     total_interest = total_payment - loan_amount
 
     return {
-        "emi": round(emi, 0),
-        "total_payment": round(total_payment, 0),
-        "total_interest": round(total_interest, 0)
+        "emi": round_money(emi),
+        "total_payment": round_money(total_payment),
+        "total_interest": round_money(total_interest)
     }
 
 @app.post("/emi")
-def emi_api(data: EMIInput):
+async def emi_api(data: EMIInput):
     return emi_calculator(
         data.loan_amount,
         data.tenure_years,
         data.annual_interest_rate
     )
+
+class EMIBatchInput(BaseModel):
+    loan_amount: List[float] = Field(max_length=MAX_BATCH_SIZE)
+    tenure_years: List[int] = Field(max_length=MAX_BATCH_SIZE)
+    annual_interest_rate: List[LoanRate] = Field(max_length=MAX_BATCH_SIZE)
+
+def emi_batch_calculator(loan_amount, tenure_years, annual_interest_rate):
+    r = annual_interest_rate / 100 / 12
+    n = tenure_years * 12
+
+    with np.errstate(all="ignore"):
+        growth_m1 = np.expm1(n * np.log1p(r))
+        emi = np.where(
+            r == 0,
+            loan_amount / n,
+            loan_amount * r * (growth_m1 + 1) / growth_m1
+        )
+
+        total_payment = emi * n
+        total_interest = total_payment - loan_amount
+
+    return {
+        "emi": round_money_list(emi),
+        "total_payment": round_money_list(total_payment),
+        "total_interest": round_money_list(total_interest)
+    }
+
+@app.post("/emi/batch")
+def emi_batch_api(data: EMIBatchInput):
+    return emi_batch_calculator(*batch_columns(
+        data.loan_amount,
+        data.tenure_years,
+        data.annual_interest_rate
+    ))
 # ---------------- SIP TENURE ----------------
 
 class SIPTenureInput(BaseModel):
     target_amount: float
     monthly_sip: float
-    annual_return: float
+    annual_return: GrowthRate
 
 def sip_tenure_calculator(target_amount, monthly_sip, annual_return):
-    monthly_r = (1 + annual_return / 100) ** (1 / 12) - 1
-
-    corpus = 0
-    months = 0
-    total_invested = 0
+    monthly_r = monthly_rate(annual_return)
 
     # Safety cap: 60 years
     max_months = 60 * 12
 
-    while corpus < target_amount and months < max_months:
-        corpus = (corpus + monthly_sip) * (1 + monthly_r)
-        total_invested += monthly_sip
-        months += 1
+    def future_value(n):
+        if monthly_r == 0:
+            return monthly_sip * n
+        growth_m1 = monthly_growth(annual_return, n)
+        return monthly_sip * growth_m1 / monthly_r * (1 + monthly_r)
+
+    # Invert the annuity-due future value for the number of months
+    if target_amount <= 0:
+        months = 0
+    elif monthly_sip <= 0:
+        months = max_months
+    else:
+        if monthly_r == 0:
+            n = target_amount / monthly_sip
+        else:
+            x = target_amount * monthly_r / (monthly_sip * (1 + monthly_r))
+            # Negative return with x <= -1: the target is never reached
+            n = math.log1p(x) / math.log1p(monthly_r) if x > -1 else math.inf
+
+        # n may be inf (or nan) when the inputs overflow
+        months = math.ceil(n) if n < max_months else max_months
+
+        # The log ratio can land just off an exact hit in either direction
+        if months > 0 and future_value(months - 1) >= target_amount:
+            months -= 1
+        elif months < max_months and future_value(months) < target_amount:
+            months += 1
+
+    corpus = future_value(months)
+    total_invested = monthly_sip * months
 
     years_required = math.ceil(months / 12)
 
     return {
         "years_required": years_required,
         "total_months": months,
-        "total_invested": round(total_invested, 0),
-        "final_corpus": round(corpus, 0)
+        "total_invested": round_money(total_invested),
+        "final_corpus": round_money(corpus)
     }
 
 @app.post("/sip-tenure")
-def sip_tenure_api(data: SIPTenureInput):
+async def sip_tenure_api(data: SIPTenureInput):
     return sip_tenure_calculator(
         data.target_amount,
         data.monthly_sip,
@@ -152,36 +432,70 @@ def sip_tenure_api(data: SIPTenureInput):
 class LumpsumInput(BaseModel):
     amount: float
     years: int
-    annual_return: float
-    inflation: Optional[float] = None
+    annual_return: GrowthRate
+    inflation: Optional[GrowthRate] = None
 
 def lumpsum_calculator(amount, years, annual_return, inflation=None):
     # Monthly compounding for consistency
-    monthly_r = (1 + annual_return / 100) ** (1 / 12) - 1
     months = years * 12
 
-    future_value = amount * ((1 + monthly_r) ** months)
+    future_value = amount * (monthly_growth(annual_return, months) + 1)
 
     result = {
-        "future_value": round(future_value, 0)
+        "future_value": round_money(future_value)
     }
 
     # Inflation-adjusted value (real value)
     if inflation is not None:
-        monthly_i = (1 + inflation / 100) ** (1 / 12) - 1
-        real_value = future_value / ((1 + monthly_i) ** months)
-        result["inflation_adjusted_value"] = round(real_value, 0)
+        real_value = future_value / (monthly_growth(inflation, months) + 1)
+        result["inflation_adjusted_value"] = round_money(real_value)
 
     return result
 
 @app.post("/lumpsum")
-def lumpsum_api(data: LumpsumInput):
+async def lumpsum_api(data: LumpsumInput):
     return lumpsum_calculator(
         data.amount,
         data.years,
         data.annual_return,
         data.inflation
     )
+
+class LumpsumBatchInput(BaseModel):
+    amount: List[float] = Field(max_length=MAX_BATCH_SIZE)
+    years: List[int] = Field(max_length=MAX_BATCH_SIZE)
+    annual_return: List[GrowthRate] = Field(max_length=MAX_BATCH_SIZE)
+    inflation: Optional[List[GrowthRate]] = Field(
+        default=None,
+        max_length=MAX_BATCH_SIZE
+    )
+
+def lumpsum_batch_calculator(amount, years, annual_return, inflation=None):
+    months = years * 12
+
+    with np.errstate(all="ignore"):
+        growth = batch_monthly_growth(annual_return, months) + 1
+        future_value = amount * growth
+
+        result = {
+            "future_value": round_money_list(future_value)
+        }
+
+        if inflation is not None:
+            real_value = future_value / (
+                batch_monthly_growth(inflation, months) + 1
+            )
+            result["inflation_adjusted_value"] = round_money_list(real_value)
+
+    return result
+
+@app.post("/lumpsum/batch")
+def lumpsum_batch_api(data: LumpsumBatchInput):
+    columns = [data.amount, data.years, data.annual_return]
+    if data.inflation is not None:
+        columns.append(data.inflation)
+
+    return lumpsum_batch_calculator(*batch_columns(*columns))
 # ---------------- EDUCATION GOAL ----------------
 
 class EducationInput(BaseModel):
@@ -211,25 +525,24 @@ def education_calculator(
         (1 + education_inflation / 100) ** years_to_college
     )
 
-    # Step 2: Inflate cost during education years
-    total_required = 0
-    for year in range(education_duration_years):
-        total_required += inflated_annual_cost * (
-            (1 + education_inflation / 100) ** year
+    # Step 2: Inflate cost during education years (geometric series)
+    f = 1 + education_inflation / 100
+    if f == 1:
+        total_required = inflated_annual_cost * education_duration_years
+    else:
+        total_required = inflated_annual_cost * (
+            (f ** education_duration_years - 1) / (f - 1)
         )
 
     # Step 3: Grow existing corpus till college (annual compounding)
-    existing_corpus_future = existing_corpus * (
-        (1 + investment_return / 100) ** years_to_college
-    )
+    investment_growth = (1 + investment_return / 100) ** years_to_college
+    existing_corpus_future = existing_corpus * investment_growth
 
     # Step 4: Gap to be funded
     gap = max(0, total_required - existing_corpus_future)
 
     # Step 5: Lump sum required today
-    lump_sum_today = gap / (
-        (1 + investment_return / 100) ** years_to_college
-    ) if gap > 0 else 0
+    lump_sum_today = gap / investment_growth if gap > 0 else 0
 
     # Step 6: Monthly SIP required (annuity due)
     monthly_r = investment_return / 100 / 12
@@ -242,21 +555,21 @@ def education_calculator(
 
     return {
         "goal_at_college": {
-            "total_required": round(total_required, 0)
+            "total_required": round_money(total_required)
         },
         "existing_corpus": {
             "today": existing_corpus,
-            "value_at_college": round(existing_corpus_future, 0)
+            "value_at_college": round_money(existing_corpus_future)
         },
         "investment_required": {
-            "lump_sum_today": round(lump_sum_today, 0),
-            "monthly_sip": round(monthly_sip, 0)
+            "lump_sum_today": round_money(lump_sum_today),
+            "monthly_sip": round_money(monthly_sip)
         }
     }
 
 
 @app.post("/education-goal")
-def education_api(data: EducationInput):
+async def education_api(data: EducationInput):
     return education_calculator(
         data.child_age,
         data.college_age,
@@ -266,6 +579,92 @@ def education_api(data: EducationInput):
         data.investment_return,
         data.education_inflation
     )
+
+class EducationBatchInput(BaseModel):
+    child_age: List[int] = Field(max_length=MAX_BATCH_SIZE)
+    college_age: List[int] = Field(max_length=MAX_BATCH_SIZE)
+    education_duration_years: List[int] = Field(max_length=MAX_BATCH_SIZE)
+    annual_cost_today: List[float] = Field(max_length=MAX_BATCH_SIZE)
+    existing_corpus: List[float] = Field(max_length=MAX_BATCH_SIZE)
+    investment_return: List[float] = Field(max_length=MAX_BATCH_SIZE)
+    education_inflation: List[float] = Field(max_length=MAX_BATCH_SIZE)
+
+
+def education_batch_kernel(
+    child_age,
+    college_age,
+    education_duration_years,
+    annual_cost_today,
+    existing_corpus,
+    investment_return,
+    education_inflation
+):
+    years_to_college = college_age - child_age
+
+    f = 1 + education_inflation / 100
+    inflated_annual_cost = annual_cost_today * f ** years_to_college
+
+    total_required = np.where(
+        f == 1,
+        inflated_annual_cost * education_duration_years,
+        inflated_annual_cost * (
+            (f ** education_duration_years - 1) / (f - 1)
+        )
+    )
+
+    investment_growth = (1 + investment_return / 100) ** years_to_college
+    existing_corpus_future = existing_corpus * investment_growth
+
+    gap = np.maximum(0, total_required - existing_corpus_future)
+
+    lump_sum_today = np.where(gap > 0, gap / investment_growth, 0)
+
+    monthly_r = investment_return / 100 / 12
+    months = years_to_college * 12
+
+    sip_factor = ((1 + monthly_r) ** months - 1) / monthly_r
+    sip_factor_due = sip_factor * (1 + monthly_r)
+
+    monthly_sip = np.where(gap > 0, gap / sip_factor_due, 0)
+
+    return total_required, existing_corpus_future, lump_sum_today, monthly_sip
+
+
+def education_batch_calculator(columns):
+    (
+        total_required,
+        existing_corpus_future,
+        lump_sum_today,
+        monthly_sip
+    ) = compute_in_tiles(education_batch_kernel, columns, 4)
+    existing_corpus = columns[4]
+
+    return {
+        "goal_at_college": {
+            "total_required": round_money_list(total_required)
+        },
+        "existing_corpus": {
+            "today": existing_corpus.tolist(),
+            "value_at_college": round_money_list(existing_corpus_future)
+        },
+        "investment_required": {
+            "lump_sum_today": round_money_list(lump_sum_today),
+            "monthly_sip": round_money_list(monthly_sip)
+        }
+    }
+
+
+@app.post("/education-goal/batch")
+def education_batch_api(data: EducationBatchInput):
+    return education_batch_calculator(np.vstack(batch_columns(
+        data.child_age,
+        data.college_age,
+        data.education_duration_years,
+        data.annual_cost_today,
+        data.existing_corpus,
+        data.investment_return,
+        data.education_inflation
+    )))
 # ---------------- RETIREMENT GOAL ----------------
 
 class RetirementInput(BaseModel):
@@ -309,17 +708,17 @@ def retirement_calculator(
     )
 
     # Step 3: Future value of existing corpus
-    fv_existing = existing_corpus * (
-        (1 + pre_retirement_return / 100) ** years_to_retirement
-    )
+    pre_growth = (1 + pre_retirement_return / 100) ** years_to_retirement
+    fv_existing = existing_corpus * pre_growth
 
     # Step 4: Future value of current SIP (annuity due)
     monthly_r = pre_retirement_return / 100 / 12
     months = years_to_retirement * 12
 
-    sip_fv = current_monthly_saving * (
-        ((1 + monthly_r) ** months - 1) / monthly_r
-    ) * (1 + monthly_r)
+    monthly_pow = (1 + monthly_r) ** months
+    sip_factor_due = (monthly_pow - 1) / monthly_r * (1 + monthly_r)
+
+    sip_fv = current_monthly_saving * sip_factor_due
 
     total_available = fv_existing + sip_fv
 
@@ -327,28 +726,24 @@ def retirement_calculator(
     shortfall = max(0, corpus_required - total_available)
 
     # Step 6: Required SIP and Lumpsum
-    sip_required = shortfall / (
-        ((1 + monthly_r) ** months - 1) / monthly_r * (1 + monthly_r)
-    ) if shortfall > 0 else 0
+    sip_required = shortfall / sip_factor_due if shortfall > 0 else 0
 
-    lump_sum_required = shortfall / (
-        (1 + pre_retirement_return / 100) ** years_to_retirement
-    ) if shortfall > 0 else 0
+    lump_sum_required = shortfall / pre_growth if shortfall > 0 else 0
 
     return {
-        "monthly_expense_at_retirement": round(monthly_expense_at_retirement, 0),
-        "corpus_required": round(corpus_required, 0),
-        "total_available": round(total_available, 0),
-        "shortfall": round(shortfall, 0),
+        "monthly_expense_at_retirement": round_money(monthly_expense_at_retirement),
+        "corpus_required": round_money(corpus_required),
+        "total_available": round_money(total_available),
+        "shortfall": round_money(shortfall),
         "investment_required": {
-            "sip": round(sip_required, 0),
-            "lumpsum": round(lump_sum_required, 0)
+            "sip": round_money(sip_required),
+            "lumpsum": round_money(lump_sum_required)
         }
     }
 
 
 @app.post("/retirement-goal")
-def retirement_api(data: RetirementInput):
+async def retirement_api(data: RetirementInput):
     return retirement_calculator(
         data.current_age,
         data.retirement_age,
@@ -360,6 +755,111 @@ def retirement_api(data: RetirementInput):
         data.pre_retirement_return,
         data.post_retirement_return
     )
+
+
+class RetirementBatchInput(BaseModel):
+    current_age: List[int] = Field(max_length=MAX_BATCH_SIZE)
+    retirement_age: List[int] = Field(max_length=MAX_BATCH_SIZE)
+    life_expectancy: List[int] = Field(max_length=MAX_BATCH_SIZE)
+    current_monthly_expense: List[float] = Field(max_length=MAX_BATCH_SIZE)
+    inflation_rate: List[float] = Field(max_length=MAX_BATCH_SIZE)
+    current_monthly_saving: List[float] = Field(max_length=MAX_BATCH_SIZE)
+    existing_corpus: List[float] = Field(max_length=MAX_BATCH_SIZE)
+    pre_retirement_return: List[float] = Field(max_length=MAX_BATCH_SIZE)
+    post_retirement_return: List[float] = Field(max_length=MAX_BATCH_SIZE)
+
+
+def retirement_batch_kernel(
+    current_age,
+    retirement_age,
+    life_expectancy,
+    current_monthly_expense,
+    inflation_rate,
+    current_monthly_saving,
+    existing_corpus,
+    pre_retirement_return,
+    post_retirement_return
+):
+    years_to_retirement = retirement_age - current_age
+    retirement_years = life_expectancy - retirement_age
+
+    monthly_expense_at_retirement = current_monthly_expense * (
+        (1 + inflation_rate / 100) ** years_to_retirement
+    )
+    annual_expense_at_retirement = monthly_expense_at_retirement * 12
+
+    real_return = ((1 + post_retirement_return / 100) /
+                   (1 + inflation_rate / 100)) - 1
+
+    corpus_required = annual_expense_at_retirement * (
+        (1 - (1 + real_return) ** (-retirement_years)) / real_return
+    )
+
+    pre_growth = (1 + pre_retirement_return / 100) ** years_to_retirement
+    fv_existing = existing_corpus * pre_growth
+
+    monthly_r = pre_retirement_return / 100 / 12
+    months = years_to_retirement * 12
+
+    monthly_pow = (1 + monthly_r) ** months
+    sip_factor_due = (monthly_pow - 1) / monthly_r * (1 + monthly_r)
+
+    sip_fv = current_monthly_saving * sip_factor_due
+
+    total_available = fv_existing + sip_fv
+
+    shortfall = np.maximum(0, corpus_required - total_available)
+
+    sip_required = np.where(shortfall > 0, shortfall / sip_factor_due, 0)
+
+    lump_sum_required = np.where(shortfall > 0, shortfall / pre_growth, 0)
+
+    return (
+        monthly_expense_at_retirement,
+        corpus_required,
+        total_available,
+        shortfall,
+        sip_required,
+        lump_sum_required
+    )
+
+
+def retirement_batch_calculator(columns):
+    (
+        monthly_expense_at_retirement,
+        corpus_required,
+        total_available,
+        shortfall,
+        sip_required,
+        lump_sum_required
+    ) = compute_in_tiles(retirement_batch_kernel, columns, 6)
+
+    return {
+        "monthly_expense_at_retirement":
+            round_money_list(monthly_expense_at_retirement),
+        "corpus_required": round_money_list(corpus_required),
+        "total_available": round_money_list(total_available),
+        "shortfall": round_money_list(shortfall),
+        "investment_required": {
+            "sip": round_money_list(sip_required),
+            "lumpsum": round_money_list(lump_sum_required)
+        }
+    }
+
+
+@app.post("/retirement-goal/batch")
+def retirement_batch_api(data: RetirementBatchInput):
+    return retirement_batch_calculator(np.vstack(batch_columns(
+        data.current_age,
+        data.retirement_age,
+        data.life_expectancy,
+        data.current_monthly_expense,
+        data.inflation_rate,
+        data.current_monthly_saving,
+        data.existing_corpus,
+        data.pre_retirement_return,
+        data.post_retirement_return
+    )))
 # ---------------- MARRIAGE GOAL ----------------
 
 class MarriageInput(BaseModel):
@@ -387,16 +887,13 @@ def marriage_calculator(
     )
 
     # Grow existing corpus
-    existing_corpus_future = existing_corpus * (
-        (1 + investment_return / 100) ** years_to_goal
-    )
+    investment_growth = (1 + investment_return / 100) ** years_to_goal
+    existing_corpus_future = existing_corpus * investment_growth
 
     gap = max(0, inflated_cost - existing_corpus_future)
 
     # Lump sum required today
-    lump_sum_today = gap / (
-        (1 + investment_return / 100) ** years_to_goal
-    ) if gap > 0 else 0
+    lump_sum_today = gap / investment_growth if gap > 0 else 0
 
     # Monthly SIP required (annuity due)
     monthly_r = investment_return / 100 / 12
@@ -408,20 +905,20 @@ def marriage_calculator(
     monthly_sip = gap / sip_factor_due if gap > 0 else 0
 
     return {
-        "goal_amount": round(inflated_cost, 0),
+        "goal_amount": round_money(inflated_cost),
         "existing_corpus": {
             "today": existing_corpus,
-            "value_at_goal": round(existing_corpus_future, 0)
+            "value_at_goal": round_money(existing_corpus_future)
         },
         "investment_required": {
-            "lump_sum_today": round(lump_sum_today, 0),
-            "monthly_sip": round(monthly_sip, 0)
+            "lump_sum_today": round_money(lump_sum_today),
+            "monthly_sip": round_money(monthly_sip)
         }
     }
 
 
 @app.post("/marriage-goal")
-def marriage_api(data: MarriageInput):
+async def marriage_api(data: MarriageInput):
     return marriage_calculator(
         data.current_age,
         data.marriage_age,
@@ -435,66 +932,66 @@ def marriage_api(data: MarriageInput):
 class CostOfDelayInput(BaseModel):
     monthly_sip: float
     years: int
-    annual_return: float
+    annual_return: GrowthRate
     delay_months: int
 
 
-def sip_future_value(monthly_sip, months, annual_return):
-    monthly_r = (1 + annual_return / 100) ** (1 / 12) - 1
-    corpus = 0
-
-    for _ in range(months):
-        corpus = (corpus + monthly_sip) * (1 + monthly_r)
-
-    return corpus
-
-
 def cost_of_delay_calculator(
     monthly_sip,
     years,
     annual_return,
     delay_months
 ):
+    monthly_r = monthly_rate(annual_return)
     total_months = years * 12
+    # A delay longer than the plan leaves no instalments to invest
+    late_months = max(0, total_months - delay_months)
+
+    # Both plans are annuities due at the same rate; only the number of
+    # instalments differs, so they share one annuity factor.
+    if monthly_r == 0:
+        fv_start_now = monthly_sip * total_months
+        fv_start_late = monthly_sip * late_months
+    else:
+        factor = monthly_sip * (1 + monthly_r) / monthly_r
 
-    # Start now
-    fv_start_now = sip_future_value(
-        monthly_sip,
-        total_months,
-        annual_return
-    )
+        # Start now
+        fv_start_now = factor * monthly_growth(annual_return, total_months)
 
-    # Start late
-    fv_start_late = sip_future_value(
-        monthly_sip,
-        total_months - delay_months,
-        annual_return
-    )
+        # Start late
+        fv_start_late = factor * monthly_growth(annual_return, late_months)
 
     total_invested_now = monthly_sip * total_months
-    total_invested_late = monthly_sip * (total_months - delay_months)
+    total_invested_late = monthly_sip * late_months
 
     return {
         "start_now": {
-            "maturity_value": round(fv_start_now, 0),
-            "amount_invested": round(total_invested_now, 0),
-            "wealth_gained": round(fv_start_now - total_invested_now, 0)
+            "maturity_value": round_money(fv_start_now),
+            "amount_invested": round_money(total_invested_now),
+            "wealth_gained": round_money(fv_start_now - total_invested_now)
         },
         "start_late": {
             "delay_months": delay_months,
-            "maturity_value": round(fv_start_late, 0),
-            "amount_invested": round(total_invested_late, 0),
-            "wealth_gained": round(fv_start_late - total_invested_late, 0)
+            "maturity_value": round_money(fv_start_late),
+            "amount_invested": round_money(total_invested_late),
+            "wealth_gained": round_money(fv_start_late - total_invested_late)
         },
-        "cost_of_delay": round(fv_start_now - fv_start_late, 0)
+        "cost_of_delay": round_money(fv_start_now - fv_start_late)
     }
 
 
 @app.post("/cost-of-delay-sip")
-def cost_of_delay_api(data: CostOfDelayInput):
+async def cost_of_delay_api(data: CostOfDelayInput):
     return cost_of_delay_calculator(
         data.monthly_sip,
         data.years,
         data.annual_return,
         data.delay_months
-    )
\ No newline at end of file
+    )
+# ---------------- ETAGS ----------------
+
+# Registered after every route so it covers all the calculator POSTs
+app.add_middleware(
+    ETagMiddleware,
+    paths=[route.path for route in app.routes if "POST" in route.methods]
+)
@@ -0,0 +1,544 @@
+import math
+import warnings
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+import main
+
+client = TestClient(main.app)
+
+
+def test_lumpsum_large_amount_beyond_int64():
+    response = client.post(
+        "/lumpsum",
+        json={"amount": 1e16, "years": 50, "annual_return": 20}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["future_value"] >= 2 ** 64
+
+
+def test_emi_large_loan_beyond_int64():
+    response = client.post(
+        "/emi",
+        json={
+            "loan_amount": 1e20,
+            "tenure_years": 20,
+            "annual_interest_rate": 8
+        }
+    )
+
+    assert response.status_code == 200
+    assert response.json()["total_payment"] >= 2 ** 64
+
+
+def test_sip_batch_money_fields_are_ints():
+    response = client.post(
+        "/sip/batch",
+        json={"monthly_sip": [1000], "years": [10], "annual_return": [12]}
+    )
+    single = client.post(
+        "/sip",
+        json={"monthly_sip": 1000, "years": 10, "annual_return": 12}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        key: [value] for key, value in single.json().items()
+    }
+    assert isinstance(response.json()["maturity_value"][0], int)
+
+
+def test_batch_non_finite_results_are_null():
+    response = client.post(
+        "/sip/batch",
+        json={
+            "monthly_sip": [1000, 1000],
+            "years": [10, 0],
+            "annual_return": [12, 12]
+        }
+    )
+
+    assert response.status_code == 200
+    assert response.json()["multiple"] == [1.87, None]
+    assert response.json()["maturity_value"] == [224036, 0]
+
+
+def test_return_at_or_below_minus_100_percent_is_rejected():
+    cases = [
+        ("/sip", {"monthly_sip": 1000, "years": 10, "annual_return": -100}),
+        ("/sip-step-up", {
+            "monthly_sip": 1000,
+            "years": 10,
+            "annual_return": -100,
+            "annual_step_up": 10
+        }),
+        ("/sip-tenure", {
+            "target_amount": 1e6,
+            "monthly_sip": 1000,
+            "annual_return": -100
+        }),
+        ("/lumpsum", {"amount": 1e5, "years": 10, "annual_return": -100}),
+        ("/lumpsum", {
+            "amount": 1e5,
+            "years": 10,
+            "annual_return": 12,
+            "inflation": -150
+        }),
+        ("/cost-of-delay-sip", {
+            "monthly_sip": 1000,
+            "years": 10,
+            "annual_return": -100,
+            "delay_months": 12
+        }),
+        ("/sip/batch", {
+            "monthly_sip": [1000],
+            "years": [10],
+            "annual_return": [-100]
+        })
+    ]
+
+    for path, body in cases:
+        assert client.post(path, json=body).status_code == 422, path
+
+
+def test_cost_of_delay_longer_than_plan():
+    response = client.post(
+        "/cost-of-delay-sip",
+        json={
+            "monthly_sip": 1000,
+            "years": 1,
+            "annual_return": 12,
+            "delay_months": 24
+        }
+    )
+
+    assert response.status_code == 200
+    start_late = response.json()["start_late"]
+    assert start_late["maturity_value"] == 0
+    assert start_late["amount_invested"] == 0
+
+
+def columns(rows):
+    return {key: [row[key] for row in rows] for key in rows[0]}
+
+
+def assert_batch_matches_single(batch_path, single_path, rows):
+    batch = client.post(batch_path, json=columns(rows))
+    assert batch.status_code == 200
+
+    def select(value, i):
+        if isinstance(value, dict):
+            return {key: select(item, i) for key, item in value.items()}
+        return value[i]
+
+    for i, row in enumerate(rows):
+        single = client.post(single_path, json=row)
+        assert single.status_code == 200
+        assert select(batch.json(), i) == single.json()
+
+
+def test_sip_batch_matches_single():
+    assert_batch_matches_single("/sip/batch", "/sip", [
+        {"monthly_sip": 1000, "years": 10, "annual_return": 12},
+        {"monthly_sip": 5000.5, "years": 25, "annual_return": 8.5},
+        {"monthly_sip": 2000, "years": 5, "annual_return": 0}
+    ])
+
+
+def test_emi_batch_matches_single():
+    assert_batch_matches_single("/emi/batch", "/emi", [
+        {"loan_amount": 1e6, "tenure_years": 20, "annual_interest_rate": 8.5},
+        {"loan_amount": 250000, "tenure_years": 5, "annual_interest_rate": 12},
+        {"loan_amount": 120000, "tenure_years": 1, "annual_interest_rate": 0}
+    ])
+
+
+def test_lumpsum_batch_matches_single():
+    assert_batch_matches_single("/lumpsum/batch", "/lumpsum", [
+        {"amount": 1e5, "years": 10, "annual_return": 12, "inflation": 6},
+        {"amount": 5e5, "years": 30, "annual_return": 8, "inflation": 0},
+        {"amount": 2e5, "years": 0, "annual_return": 0, "inflation": 4}
+    ])
+    assert_batch_matches_single("/lumpsum/batch", "/lumpsum", [
+        {"amount": 1e5, "years": 10, "annual_return": 12},
+        {"amount": 5e5, "years": 30, "annual_return": 8}
+    ])
+
+
+def test_education_batch_matches_single():
+    assert_batch_matches_single("/education-goal/batch", "/education-goal", [
+        {
+            "child_age": 5,
+            "college_age": 18,
+            "education_duration_years": 4,
+            "annual_cost_today": 2e5,
+            "existing_corpus": 1e5,
+            "investment_return": 12,
+            "education_inflation": 8
+        },
+        {
+            "child_age": 10,
+            "college_age": 18,
+            "education_duration_years": 2,
+            "annual_cost_today": 5e5,
+            "existing_corpus": 0,
+            "investment_return": 10,
+            "education_inflation": 0
+        },
+        {
+            "child_age": 2,
+            "college_age": 18,
+            "education_duration_years": 4,
+            "annual_cost_today": 1e5,
+            "existing_corpus": 5e6,
+            "investment_return": 8,
+            "education_inflation": 6
+        }
+    ])
+
+
+def test_retirement_batch_matches_single():
+    assert_batch_matches_single("/retirement-goal/batch", "/retirement-goal", [
+        {
+            "current_age": 30,
+            "retirement_age": 60,
+            "life_expectancy": 85,
+            "current_monthly_expense": 50000,
+            "inflation_rate": 6,
+            "current_monthly_saving": 10000,
+            "existing_corpus": 1e6,
+            "pre_retirement_return": 12,
+            "post_retirement_return": 8
+        },
+        {
+            "current_age": 45,
+            "retirement_age": 60,
+            "life_expectancy": 80,
+            "current_monthly_expense": 80000,
+            "inflation_rate": 5,
+            "current_monthly_saving": 0,
+            "existing_corpus": 0,
+            "pre_retirement_return": 10,
+            "post_retirement_return": 7
+        },
+        {
+            "current_age": 35,
+            "retirement_age": 55,
+            "life_expectancy": 85,
+            "current_monthly_expense": 30000,
+            "inflation_rate": 6,
+            "current_monthly_saving": 200000,
+            "existing_corpus": 5e7,
+            "pre_retirement_return": 12,
+            "post_retirement_return": 8
+        }
+    ])
+
+
+def test_batch_size_is_limited():
+    n = main.MAX_BATCH_SIZE + 1
+    response = client.post(
+        "/sip/batch",
+        json={
+            "monthly_sip": [1000] * n,
+            "years": [10] * n,
+            "annual_return": [12] * n
+        }
+    )
+
+    assert response.status_code == 422
+
+    response = client.post(
+        "/lumpsum/batch",
+        json={
+            "amount": [1e5],
+            "years": [10],
+            "annual_return": [12],
+            "inflation": [6] * n
+        }
+    )
+
+    assert response.status_code == 422
+
+
+def test_batch_lists_must_have_equal_length():
+    response = client.post(
+        "/sip/batch",
+        json={"monthly_sip": [1000], "years": [10, 20], "annual_return": [12]}
+    )
+
+    assert response.status_code == 422
+
+
+SIP_BODY = {"monthly_sip": 1000, "years": 10, "annual_return": 12}
+
+
+def test_etag_matches_return_not_modified():
+    etag = client.post("/sip", json=SIP_BODY).headers["etag"]
+
+    for if_none_match in [etag, "W/" + etag, '"other", ' + etag]:
+        response = client.post(
+            "/sip",
+            json=SIP_BODY,
+            headers={"If-None-Match": if_none_match}
+        )
+
+        assert response.status_code == 304, if_none_match
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+
+def test_etag_mismatch_returns_body():
+    for if_none_match in ['"other"', "*"]:
+        response = client.post(
+            "/sip",
+            json=SIP_BODY,
+            headers={"If-None-Match": if_none_match}
+        )
+
+        assert response.status_code == 200, if_none_match
+        assert response.json()["maturity_value"] == 224036
+
+
+def test_etag_keeps_repeated_headers():
+    app = FastAPI()
+    app.add_middleware(main.ETagMiddleware, paths=["/cookies"])
+
+    @app.post("/cookies")
+    def cookies():
+        response = JSONResponse({"ok": True})
+        response.set_cookie("a", "1")
+        response.set_cookie("b", "2")
+        return response
+
+    response = TestClient(app).post("/cookies")
+
+    assert response.headers.get_list("set-cookie") == [
+        "a=1; Path=/; SameSite=lax",
+        "b=2; Path=/; SameSite=lax"
+    ]
+    assert "etag" in response.headers
+
+
+def test_etag_only_on_successful_calculator_posts():
+    assert "etag" not in client.get("/").headers
+
+    response = client.post("/sip", json={})
+    assert response.status_code == 422
+    assert "etag" not in response.headers
+
+
+def test_emi_rate_at_or_below_minus_1200_percent_is_rejected():
+    response = client.post(
+        "/emi",
+        json={
+            "loan_amount": 1e6,
+            "tenure_years": 20,
+            "annual_interest_rate": -1300
+        }
+    )
+    assert response.status_code == 422
+
+    response = client.post(
+        "/emi/batch",
+        json={
+            "loan_amount": [1e6],
+            "tenure_years": [20],
+            "annual_interest_rate": [-1200]
+        }
+    )
+    assert response.status_code == 422
+
+
+def test_batch_edge_cases_do_not_warn():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+
+        main.emi_batch_calculator(*main.batch_columns(
+            [1e6, 1e6], [0, 20], [8, 0]
+        ))
+        main.lumpsum_batch_calculator(*main.batch_columns(
+            [1e300, 1e5], [1000, 10], [1000, 12], [6, 1000]
+        ))
+        main.sip_batch_calculator(*main.batch_columns(
+            [1e300, 1000], [1000, 0], [1000, 12]
+        ))
+
+
+def test_sip_tenure_overflowing_inputs_hit_the_cap():
+    for target_amount in [1e300, 1e10]:
+        result = main.sip_tenure_calculator(target_amount, 1e-300, 12.0)
+
+        assert result["total_months"] == 720
+
+
+def test_sip_tenure_just_above_a_month_boundary():
+    for annual_return in [0.5, 6.0, 12.0]:
+        monthly_r = main.monthly_rate(annual_return)
+        fv_two_months = (
+            1000 * main.monthly_growth(annual_return, 2)
+            / monthly_r * (1 + monthly_r)
+        )
+        target_amount = math.nextafter(fv_two_months, math.inf)
+
+        result = main.sip_tenure_calculator(target_amount, 1000, annual_return)
+
+        assert result["total_months"] == 3, annual_return
+
+
+# Reference loops from the original month-by-month implementations, used
+# to pin the closed forms' special cases to the old results.
+
+def loop_sip_step_up(monthly_sip, years, annual_return, annual_step_up):
+    monthly_r = (1 + annual_return / 100) ** (1 / 12) - 1
+    corpus = 0
+    total_invested = 0
+    current_sip = monthly_sip
+
+    for month in range(1, years * 12 + 1):
+        if month > 1 and (month - 1) % 12 == 0:
+            current_sip *= (1 + annual_step_up / 100)
+
+        corpus = (corpus + current_sip) * (1 + monthly_r)
+        total_invested += current_sip
+
+    return corpus, total_invested
+
+
+def test_sip_step_up_special_cases_match_loop():
+    cases = [
+        # Step-up equal to the return: the g12 == s limit
+        (1000, 30, 10, 10),
+        (1000, 1, 12, 12),
+        (5000, 20, 12, 12.0000000001),
+        # No step-up: s == 1
+        (1000, 15, 12, 0),
+        (1000, 15, 0, 0),
+        # Step-up of -100%: only the first year is invested
+        (1000, 10, 12, -100),
+        # Zero return with a step-up
+        (1000, 10, 0, 10)
+    ]
+
+    for monthly_sip, years, annual_return, annual_step_up in cases:
+        corpus, total_invested = loop_sip_step_up(
+            monthly_sip, years, annual_return, annual_step_up
+        )
+        result = main.sip_step_up_calculator(
+            monthly_sip, years, annual_return, annual_step_up
+        )
+
+        assert result["maturity_value"] == main.round_money(corpus)
+        assert result["total_invested"] == main.round_money(total_invested)
+
+
+def loop_sip_tenure(target_amount, monthly_sip, annual_return):
+    monthly_r = (1 + annual_return / 100) ** (1 / 12) - 1
+    corpus = 0
+    months = 0
+
+    while corpus < target_amount and months < 60 * 12:
+        corpus = (corpus + monthly_sip) * (1 + monthly_r)
+        months += 1
+
+    return months, corpus
+
+
+def test_sip_tenure_exact_hits_and_cap_match_loop():
+    cases = [
+        # Targets exactly reached after a whole number of months
+        (12000, 1000, 0),
+        (720000, 1000, 0),
+        # Unreachable targets stop at the 60-year cap
+        (720001, 1000, 0),
+        (1e12, 1000, 12),
+        (1e6, 1000, -10),
+        (1e6, 0, 12)
+    ]
+
+    # Targets just below and just above the corpus after a given month,
+    # up to the cap; the loop and closed form differ in the last few ulps,
+    # so exact float hits are covered by the nextafter test instead
+    for annual_return in [6, 12]:
+        for months in [1, 12, 119, 360, 719, 720]:
+            monthly_r = (1 + annual_return / 100) ** (1 / 12) - 1
+            corpus = 0
+            for _ in range(months):
+                corpus = (corpus + 1000) * (1 + monthly_r)
+            cases.append((math.floor(corpus), 1000, annual_return))
+            cases.append((math.floor(corpus) + 1, 1000, annual_return))
+
+    for target_amount, monthly_sip, annual_return in cases:
+        months, corpus = loop_sip_tenure(
+            target_amount, monthly_sip, annual_return
+        )
+        result = main.sip_tenure_calculator(
+            target_amount, monthly_sip, annual_return
+        )
+
+        assert result["total_months"] == months, target_amount
+        assert result["final_corpus"] == main.round_money(corpus)
+
+
+def loop_education_total(
+    child_age,
+    college_age,
+    education_duration_years,
+    annual_cost_today,
+    education_inflation
+):
+    inflated_annual_cost = annual_cost_today * (
+        (1 + education_inflation / 100) ** (college_age - child_age)
+    )
+
+    total_required = 0
+    for year in range(education_duration_years):
+        total_required += inflated_annual_cost * (
+            (1 + education_inflation / 100) ** year
+        )
+
+    return total_required
+
+
+def test_education_total_required_matches_loop():
+    cases = [
+        # No inflation: f == 1
+        (5, 18, 4, 2e5, 0),
+        (10, 18, 1, 5e5, 0),
+        # Inflation of -100%: f == 0
+        (5, 18, 4, 2e5, -100),
+        (5, 18, 4, 2e5, 8),
+        (0, 18, 6, 3e5, 10.5),
+        (5, 18, 0, 2e5, 8)
+    ]
+
+    for (
+        child_age,
+        college_age,
+        education_duration_years,
+        annual_cost_today,
+        education_inflation
+    ) in cases:
+        total_required = loop_education_total(
+            child_age,
+            college_age,
+            education_duration_years,
+            annual_cost_today,
+            education_inflation
+        )
+        result = main.education_calculator(
+            child_age,
+            college_age,
+            education_duration_years,
+            annual_cost_today,
+            1e5,
+            12,
+            education_inflation
+        )
+
+        assert result["goal_at_college"]["total_required"] == (
+            main.round_money(total_required)
+        )